@@ -17,8 +17,9 @@ with open(sys.argv[1], "r", encoding="utf-8") as file:
 
 for track in gpx.tracks:
     for segment in track.segments:
-        line = [staticmaps.create_latlng(p.latitude, p.longitude) for p in segment.points]
-        context.add_object(staticmaps.Line(line))
+        lats = [p.latitude for p in segment.points]
+        lngs = [p.longitude for p in segment.points]
+        context.add_object(staticmaps.Line.from_degrees(lats, lngs))
 
 # add an image marker to the first track point
 for p in gpx.walk(only_points=True):
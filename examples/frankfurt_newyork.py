@@ -23,6 +23,7 @@ image.save("frankfurt_newyork.pillow.png")
 if staticmaps.cairo_is_supported():
     image = context.render_cairo(800, 500)
     image.write_to_png("frankfurt_newyork.cairo.png")
+    context.release_cairo_surface(image)
 
 # render svg
 svg_image = context.render_svg(800, 500)
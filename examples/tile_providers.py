@@ -27,6 +27,7 @@ for name, provider in staticmaps.default_tile_providers.items():
     if staticmaps.cairo_is_supported():
         image = context.render_cairo(800, 500)
         image.write_to_png(f"provider_{name}.cairo.png")
+        context.release_cairo_surface(image)
 
     # render svg
     context.set_tighten_to_bounds()
@@ -4,7 +4,7 @@
 # flake8: noqa
 from .area import Area
 from .bounds import Bounds
-from .cairo_renderer import CairoRenderer, cairo_is_supported
+from .cairo_renderer import CairoRenderer, CairoTileCache, cairo_is_supported
 from .circle import Circle
 from .color import (
     BLACK,
@@ -22,7 +22,7 @@ from .color import (
     random_color,
 )
 from .context import Context
-from .coordinates import create_latlng, parse_latlng, parse_latlngs, parse_latlngs2rect
+from .coordinates import create_latlng, create_latlngs, parse_latlng, parse_latlngs, parse_latlngs2rect
 from .image_marker import ImageMarker
 from .line import Line
 from .marker import Marker
@@ -49,6 +49,7 @@ __all__ = [
     "Area",
     "Bounds",
     "CairoRenderer",
+    "CairoTileCache",
     "cairo_is_supported",
     "Circle",
     "BLACK",
@@ -66,6 +67,7 @@ __all__ = [
     "random_color",
     "Context",
     "create_latlng",
+    "create_latlngs",
     "parse_latlng",
     "parse_latlngs",
     "parse_latlngs2rect",
@@ -44,10 +44,7 @@ class Area(Line):
         Parameters:
             renderer (PillowRenderer): pillow renderer
         """
-        xys = [
-            (x + renderer.offset_x(), y)
-            for (x, y) in [renderer.transformer().ll2pixel(latlng) for latlng in self.interpolate()]
-        ]
+        xys = [(x + renderer.offset_x(), y) for (x, y) in self.pixels(renderer.transformer())]
         overlay = PIL_Image.new("RGBA", renderer.image().size, (255, 255, 255, 0))
         draw = PIL_ImageDraw.Draw(overlay)
         draw.polygon(xys, fill=self.fill_color().int_rgba())
@@ -61,17 +58,18 @@ class Area(Line):
         Parameters:
             renderer (SvgRenderer): svg renderer
         """
-        xys = [renderer.transformer().ll2pixel(latlng) for latlng in self.interpolate()]
+        xys = self.pixels(renderer.transformer())
 
-        polygon = renderer.drawing().polygon(
+        polygon = renderer.polyline_path(
             xys,
+            closed=True,
             fill=self.fill_color().hex_rgb(),
             opacity=self.fill_color().float_a(),
         )
         renderer.group().add(polygon)
 
         if self.width() > 0:
-            polyline = renderer.drawing().polyline(
+            polyline = renderer.polyline_path(
                 xys,
                 fill="none",
                 stroke=self.color().hex_rgb(),
@@ -86,7 +84,7 @@ class Area(Line):
         Parameters:
             renderer (CairoRenderer): cairo renderer
         """
-        xys = [renderer.transformer().ll2pixel(latlng) for latlng in self.interpolate()]
+        xys = self.pixels(renderer.transformer())
 
         renderer.context().set_source_rgba(*self.fill_color().float_rgba())
         renderer.context().new_path()
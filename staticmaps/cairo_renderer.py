@@ -3,10 +3,13 @@
 # py-staticmaps
 # Copyright (c) 2020 Florian Pigorsch; see /LICENSE for licensing information
 
+import collections
 import io
 import math
 import sys
+import threading
 import typing
+from concurrent.futures import Executor, ThreadPoolExecutor, as_completed
 
 # import s2sphere  # type: ignore
 
@@ -38,19 +41,96 @@ def cairo_is_supported() -> bool:
 # Dummy types, so that type annotation works if cairo is missing.
 cairo_Context = typing.Any
 cairo_ImageSurface = typing.Any
+cairo_RecordingSurface = typing.Any
+
+TileKeyT = typing.Tuple[int, int, int]
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+class CairoTileCache:
+    """A thread-safe LRU cache of decoded cairo tile images, keyed by (zoom, x, y)"""
+
+    def __init__(self, max_size: int = 256) -> None:
+        if max_size < 1:
+            raise ValueError(f"'max_size' must be >= 1: {max_size}")
+        self._max_size = max_size
+        self._tiles: "collections.OrderedDict[TileKeyT, cairo_ImageSurface]" = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, zoom: int, x: int, y: int) -> typing.Optional[cairo_ImageSurface]:
+        """Return a cached tile image
+
+        Parameters:
+            zoom (int): zoom of the tile
+            x (int): x index of the tile
+            y (int): y index of the tile
+
+        Returns:
+            typing.Optional[cairo_ImageSurface]: cairo image surface, None if the tile is not cached
+        """
+        key = (zoom, x, y)
+        with self._lock:
+            tile_img = self._tiles.get(key)
+            if tile_img is not None:
+                self._tiles.move_to_end(key)
+            return tile_img
+
+    def put(self, zoom: int, x: int, y: int, tile_img: cairo_ImageSurface) -> None:
+        """Add a tile image to the cache, evicting the least recently used tiles if the cache is full
+
+        Parameters:
+            zoom (int): zoom of the tile
+            x (int): x index of the tile
+            y (int): y index of the tile
+            tile_img (cairo_ImageSurface): cairo image surface
+        """
+        key = (zoom, x, y)
+        with self._lock:
+            self._tiles[key] = tile_img
+            self._tiles.move_to_end(key)
+            while len(self._tiles) > self._max_size:
+                self._tiles.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all tile images from the cache"""
+        with self._lock:
+            self._tiles.clear()
 
 
 class CairoRenderer(Renderer):
     """An image renderer using cairo that extends a generic renderer class"""
 
-    def __init__(self, transformer: Transformer) -> None:
+    def __init__(
+        self,
+        transformer: Transformer,
+        tile_cache: typing.Optional[CairoTileCache] = None,
+        surface: typing.Optional[cairo_ImageSurface] = None,
+        alpha: bool = True,
+    ) -> None:
         Renderer.__init__(self, transformer)
+        self._tile_cache = tile_cache
 
         if not cairo_is_supported():
             raise RuntimeError("Cannot render to Cairo since the 'cairo' module could not be imported.")
 
-        self._surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, *self._trans.image_size())
-        self._context = cairo.Context(self._surface)
+        # without an alpha channel (i.e. for images with an opaque background), cairo can use its cheaper
+        # compositing paths
+        surface_format = cairo.FORMAT_ARGB32 if alpha else cairo.FORMAT_RGB24
+        if surface is None:
+            self._surface = cairo.ImageSurface(surface_format, *self._trans.image_size())
+            self._context = cairo.Context(self._surface)
+        else:
+            # reuse a previously rendered surface => clear it first
+            if (surface.get_width(), surface.get_height()) != self._trans.image_size():
+                raise ValueError("Cannot reuse a cairo surface that doesn't match the image size.")
+            if surface.get_format() != surface_format:
+                raise ValueError("Cannot reuse a cairo surface that doesn't match the image format.")
+            self._surface = surface
+            self._context = cairo.Context(self._surface)
+            self._context.set_operator(cairo.OPERATOR_CLEAR)
+            self._context.paint()
+            self._context.set_operator(cairo.OPERATOR_OVER)
 
     def image_surface(self) -> cairo_ImageSurface:
         """
@@ -66,24 +146,48 @@ class CairoRenderer(Renderer):
         """
         return self._context
 
+    @staticmethod
+    def has_alpha(surface: cairo_ImageSurface) -> bool:
+        """Check whether a cairo image surface has an alpha channel
+
+        Parameters:
+            surface (cairo.ImageSurface): cairo image surface
+
+        Returns:
+            bool: True if the surface has an alpha channel
+        """
+        return bool(surface.get_format() != cairo.FORMAT_RGB24)
+
     @staticmethod
     def create_image(image_data: bytes) -> cairo_ImageSurface:
         """Create a cairo image
 
+        PNG data is decoded by cairo directly; other formats are decoded by pillow and copied into a cairo surface.
+
         Parameters:
             image_data (bytes): Image data
 
         Returns:
             cairo.ImageSurface: cairo image surface
         """
-        image = PIL_Image.open(io.BytesIO(image_data))
-        if image.format == "PNG":
+        if image_data[:8] == PNG_SIGNATURE:
+            # BytesIO shares the (immutable) bytes object until it is written to => no copy of the tile data
             return cairo.ImageSurface.create_from_png(io.BytesIO(image_data))
-        png_bytes = io.BytesIO()
-        image.save(png_bytes, format="PNG")
-        png_bytes.flush()
-        png_bytes.seek(0)
-        return cairo.ImageSurface.create_from_png(png_bytes)
+        image = PIL_Image.open(io.BytesIO(image_data))
+        if sys.byteorder != "little":
+            # cairo's native-endian ARGB32 has no matching pillow raw mode => go via PNG
+            png_bytes = io.BytesIO()
+            image.save(png_bytes, format="PNG")
+            png_bytes.seek(0)
+            return cairo.ImageSurface.create_from_png(png_bytes)
+        # pillow only converts RGB(A) images to premultiplied alpha => expand palette, grayscale, ... images first
+        rgba = image if image.mode in ("RGB", "RGBA") else image.convert("RGBA")
+        # cairo expects premultiplied alpha, stored as B, G, R, A bytes on little-endian machines
+        premultiplied = rgba.convert("RGBa")
+        width, height = premultiplied.size
+        stride = cairo.ImageSurface.format_stride_for_width(cairo.FORMAT_ARGB32, width)
+        data = bytearray(premultiplied.tobytes("raw", "BGRa", stride))
+        return cairo.ImageSurface.create_for_data(data, cairo.FORMAT_ARGB32, width, height, stride)
 
     def render_objects(
         self,
@@ -96,13 +200,69 @@ class CairoRenderer(Renderer):
             objects (typing.List["Object"]): objects of static map
             tighten (bool): tighten to boundaries
         """
-        x_count = math.ceil(self._trans.image_width() / (2 * self._trans.world_width()))
+        # only the transformation matrix changes between the world copies => set it directly instead of
+        # pushing/popping the whole graphics state for each copy
+        ctx = self._context
+        ww = self._trans.world_width()
+        base_matrix = ctx.get_matrix()
+        for batch in self._batch_objects(objects):
+            copies = self.world_copies(batch)
+            # build the paths only once if the objects are visible in multiple world copies, and replay them
+            recording = self._record_batch(batch) if len(copies) > 1 else None
+            for p in copies:
+                ctx.set_matrix(cairo.Matrix(x0=p * ww).multiply(base_matrix))
+                if recording is None:
+                    self._render_batch(batch)
+                else:
+                    ctx.set_source_surface(recording, 0, 0)
+                    ctx.paint()
+        self._context.set_matrix(base_matrix)
+
+    def _render_batch(self, batch: typing.List["Object"]) -> None:
+        if len(batch) == 1:
+            batch[0].render_cairo(self)
+        else:
+            batch[0].render_cairo_batch(self, batch)
+
+    def _record_batch(self, batch: typing.List["Object"]) -> cairo_RecordingSurface:
+        """Render a batch of objects into an (unbounded) recording surface
+
+        Parameters:
+            batch (typing.List["Object"]): objects rendered together
+
+        Returns:
+            cairo.RecordingSurface: recording of the rendered objects
+        """
+        recording = cairo.RecordingSurface(cairo.CONTENT_COLOR_ALPHA, None)
+        context = self._context
+        # objects draw via self.context() => temporarily redirect it to the recording
+        self._context = cairo.Context(recording)
+        try:
+            self._render_batch(batch)
+        finally:
+            self._context = context
+        return recording
+
+    @staticmethod
+    def _batch_objects(objects: typing.List["Object"]) -> typing.List[typing.List["Object"]]:
+        """Group consecutive objects with equal cairo batch keys
+
+        Parameters:
+            objects (typing.List["Object"]): objects of static map
+
+        Returns:
+            typing.List[typing.List["Object"]]: batches of objects, in rendering order
+        """
+        batches: typing.List[typing.List["Object"]] = []
+        last_key: typing.Optional[typing.Hashable] = None
         for obj in objects:
-            for p in range(-x_count, x_count + 1):
-                self._context.save()
-                self._context.translate(p * self._trans.world_width(), 0)
-                obj.render_cairo(self)
-                self._context.restore()
+            key = obj.cairo_batch_key()
+            if key is not None and key == last_key:
+                batches[-1].append(obj)
+            else:
+                batches.append([obj])
+            last_key = key
+        return batches
 
     def render_background(self, color: typing.Optional[Color]) -> None:
         """Render background of static map
@@ -121,34 +281,65 @@ class CairoRenderer(Renderer):
         download: typing.Callable[[int, int, int], typing.Optional[bytes]],
         objects: typing.List["Object"],
         tighten: bool,
+        max_workers: int = 8,
+        executor: typing.Optional[Executor] = None,
     ) -> None:
         """Render tiles of static map
 
+        Tiles are downloaded and decoded in parallel by a thread pool; only painting happens on the calling thread,
+        since cairo contexts are not thread-safe. Tiles completely hidden behind opaque objects are skipped.
+
         Parameters:
             download (typing.Callable[[int, int, int], typing.Optional[bytes]]): url of tiles provider
             objects (typing.List["Object"]): objects of static map
             tighten (bool): tighten to boundaries
+            max_workers (int): maximum number of parallel tile downloads, if no executor is given
+            executor (typing.Optional[Executor]): thread pool for downloading the tiles, None to use a temporary one
         """
-        for yy in range(0, self._trans.tiles_y()):
-            y = self._trans.first_tile_y() + yy
-            if y < 0 or y >= self._trans.number_of_tiles():
+        ts = self._trans.tile_size()
+        ox = self._trans.tile_offset_x()
+        oy = self._trans.tile_offset_y()
+        zoom = self._trans.zoom()
+        # map each distinct tile to all of its pixel positions (a tile may appear multiple times due to wraparound)
+        jobs: typing.Dict[typing.Tuple[int, int], typing.List[typing.Tuple[int, int]]] = {}
+        for xx, yy, x, y in self.visible_tiles(objects):
+            jobs.setdefault((x, y), []).append((int(xx * ts + ox), int(yy * ts + oy)))
+        if self._tile_cache is not None:
+            for (x, y), positions in list(jobs.items()):
+                tile_img = self._tile_cache.get(zoom, x, y)
+                if tile_img is not None:
+                    self._paint_tile(tile_img, positions)
+                    del jobs[(x, y)]
+        if not jobs:
+            return
+
+        if executor is None:
+            with ThreadPoolExecutor(max_workers=max_workers) as temporary_executor:
+                self._fetch_and_paint_tiles(temporary_executor, download, jobs)
+        else:
+            self._fetch_and_paint_tiles(executor, download, jobs)
+
+    def _fetch_and_paint_tiles(
+        self,
+        executor: Executor,
+        download: typing.Callable[[int, int, int], typing.Optional[bytes]],
+        jobs: typing.Dict[typing.Tuple[int, int], typing.List[typing.Tuple[int, int]]],
+    ) -> None:
+        futures = {executor.submit(self.fetch_tile, download, x, y): positions for (x, y), positions in jobs.items()}
+        for future in as_completed(futures):
+            try:
+                tile_img = future.result()
+            except RuntimeError:
                 continue
-            for xx in range(0, self._trans.tiles_x()):
-                x = (self._trans.first_tile_x() + xx) % self._trans.number_of_tiles()
-                try:
-                    tile_img = self.fetch_tile(download, x, y)
-                    if tile_img is None:
-                        continue
-                    self._context.save()
-                    self._context.translate(
-                        int(xx * self._trans.tile_size() + self._trans.tile_offset_x()),
-                        int(yy * self._trans.tile_size() + self._trans.tile_offset_y()),
-                    )
-                    self._context.set_source_surface(tile_img)
-                    self._context.paint()
-                    self._context.restore()
-                except RuntimeError:
-                    pass
+            if tile_img is not None:
+                self._paint_tile(tile_img, futures[future])
+
+    def _paint_tile(self, tile_img: cairo_ImageSurface, positions: typing.List[typing.Tuple[int, int]]) -> None:
+        ctx = self._context
+        for tx, ty in positions:
+            # the source offset positions the tile => no need to save/translate/restore the graphics state
+            ctx.set_source_surface(tile_img, tx, ty)
+            ctx.paint()
 
     def render_attribution(self, attribution: typing.Optional[str]) -> None:
         """Render attribution from given tiles provider
@@ -160,14 +351,17 @@ class CairoRenderer(Renderer):
             return
         width, height = self._trans.image_size()
         self._context.select_font_face("Sans", cairo.FONT_SLANT_NORMAL, cairo.FONT_WEIGHT_NORMAL)
+        # text width scales linearly with the font size => measure once at a reference size and solve for the
+        # largest font size (in steps of 0.25, at most 9) that fits into the image width
         font_size = 9.0
-        while True:
-            self._context.set_font_size(font_size)
-            _, f_descent, f_height, _, _ = self._context.font_extents()
-            t_width = self._context.text_extents(attribution).width
-            if t_width < width - 4:
-                break
-            font_size -= 0.25
+        ref_font_size = 10.0
+        self._context.set_font_size(ref_font_size)
+        ref_width = self._context.text_extents(attribution).width
+        if ref_width > 0:
+            font_size = math.floor(4 * (width - 4) * ref_font_size / ref_width) / 4
+            font_size = max(0.25, min(9.0, font_size))
+        self._context.set_font_size(font_size)
+        _, f_descent, f_height, _, _ = self._context.font_extents()
         self._context.set_source_rgba(*WHITE.float_rgb(), 0.8)
         self._context.rectangle(0, height - f_height - f_descent - 2, width, height)
         self._context.fill()
@@ -191,7 +385,14 @@ class CairoRenderer(Renderer):
         Returns:
             typing.Optional[cairo_ImageSurface]: cairo image surface
         """
+        if self._tile_cache is not None:
+            tile_img = self._tile_cache.get(self._trans.zoom(), x, y)
+            if tile_img is not None:
+                return tile_img
         image_data = download(self._trans.zoom(), x, y)
         if image_data is None:
             return None
-        return self.create_image(image_data)
+        tile_img = self.create_image(image_data)
+        if self._tile_cache is not None:
+            self._tile_cache.put(self._trans.zoom(), x, y, tile_img)
+        return tile_img
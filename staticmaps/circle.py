@@ -1,6 +1,7 @@
 """py-staticmaps - circle"""
 # Copyright (c) 2020 Florian Pigorsch; see /LICENSE for licensing information
 
+import math
 import typing
 
 import s2sphere  # type: ignore
@@ -9,6 +10,7 @@ from geographiclib.geodesic import Geodesic  # type: ignore
 from .area import Area
 from .color import RED, TRANSPARENT, Color
 from .coordinates import create_latlng
+from .transformer import Transformer
 
 
 class Circle(Area):
@@ -27,6 +29,45 @@ class Circle(Area):
         width: int = 0,
     ) -> None:
         Area.__init__(self, list(Circle.compute_circle(center, radius_km)), fill_color, color, width)
+        self._center = center
+
+    def opaque_pixel_rect(self, trans: Transformer) -> typing.Optional[typing.Tuple[float, float, float, float]]:
+        """Return a pixel rect (left, top, right, bottom) that is completely covered by the fill of the circle
+
+        This is the square inscribed into the largest disc around the projected center that doesn't touch the
+        outline, shrunk by a pixel for antialiasing.
+
+        Parameters:
+            trans (Transformer): transformer
+
+        Returns:
+            typing.Optional[typing.Tuple[float, float, float, float]]: opaque pixel rectangle, None if there is none
+        """
+        if self.fill_color().int_rgba()[3] != 255:
+            return None
+        cx, cy = trans.ll2pixel(self._center)
+        xys = self.pixels(trans)
+        # winding number of the outline around the center (cairo fills using the non-zero winding rule); far
+        # from the equator the projected outline gets distorted and may not enclose the center at all
+        winding = 0.0
+        radius2 = math.inf
+        x1, y1 = xys[-1][0] - cx, xys[-1][1] - cy
+        for x, y in xys:
+            x2, y2 = x - cx, y - cy
+            winding += math.atan2(x1 * y2 - y1 * x2, x1 * x2 + y1 * y2)
+            # squared distance of the center to the outline segment
+            dx, dy = x2 - x1, y2 - y1
+            d2 = dx * dx + dy * dy
+            t = 0.0 if d2 == 0 else max(0.0, min(1.0, -(x1 * dx + y1 * dy) / d2))
+            ex, ey = x1 + t * dx, y1 + t * dy
+            radius2 = min(radius2, ex * ex + ey * ey)
+            x1, y1 = x2, y2
+        if abs(winding) < math.pi:
+            return None
+        half = math.sqrt(radius2) / math.sqrt(2) - 1
+        if half <= 0:
+            return None
+        return cx - half, cy - half, cx + half, cy + half
 
     @staticmethod
     def compute_circle(center: s2sphere.LatLng, radius_km: float) -> typing.Iterator[s2sphere.LatLng]:
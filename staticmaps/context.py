@@ -6,13 +6,14 @@
 import math
 import os
 import typing
+from concurrent.futures import Future, ThreadPoolExecutor
 
 import appdirs  # type: ignore
 import s2sphere  # type: ignore
 import svgwrite  # type: ignore
 from PIL import Image as PIL_Image  # type: ignore
 
-from .cairo_renderer import CairoRenderer, cairo_is_supported
+from .cairo_renderer import CairoRenderer, CairoTileCache, cairo_is_supported
 from .color import Color
 from .meta import LIB_NAME
 from .object import Object, PixelBoundsT
@@ -24,7 +25,11 @@ from .transformer import Transformer
 
 
 class Context:
-    """Context"""
+    """Context
+
+    Tiles are downloaded by a thread pool that is created on the first rendering and kept for later renderings.
+    Call close() (or use the context as a context manager) to shut it down.
+    """
 
     # pylint: disable=too-many-instance-attributes
     def __init__(self) -> None:
@@ -36,6 +41,26 @@ class Context:
         self._tile_downloader = TileDownloader()
         self._cache_dir = os.path.join(appdirs.user_cache_dir(LIB_NAME), "tiles")
         self._tighten_to_bounds: bool = False
+        self._max_download_workers = 8
+        self._cairo_tile_cache = CairoTileCache()
+        self._download_executor: typing.Optional[ThreadPoolExecutor] = None
+        self._pending_tiles: typing.Dict[typing.Tuple[int, int, int], Future] = {}
+        self._cairo_surface_pool: typing.Dict[typing.Tuple[int, int, bool], typing.List[typing.Any]] = {}
+
+    def __enter__(self) -> "Context":
+        return self
+
+    def __exit__(self, *args: typing.Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Shut down the tile download threads
+
+        The context stays usable; a later rendering starts new download threads.
+        """
+        if self._download_executor is not None:
+            self._download_executor.shutdown(wait=True)
+            self._download_executor = None
 
     def set_zoom(self, zoom: int) -> None:
         """Set zoom for static map
@@ -73,6 +98,7 @@ class Context:
             directory (str): cache directory
         """
         self._cache_dir = directory
+        self._cairo_tile_cache.clear()
 
     def set_tile_downloader(self, downloader: TileDownloader) -> None:
         """Set tile downloader
@@ -81,6 +107,7 @@ class Context:
             downloader (TileDownloader): tile downloader
         """
         self._tile_downloader = downloader
+        self._cairo_tile_cache.clear()
 
     def set_tile_provider(self, provider: TileProvider, api_key: typing.Optional[str] = None) -> None:
         """Set tile provider
@@ -92,6 +119,7 @@ class Context:
         self._tile_provider = provider
         if api_key:
             self._tile_provider.set_api_key(api_key)
+        self._cairo_tile_cache.clear()
 
     def set_tighten_to_bounds(self, tighten: bool = False) -> None:
         """Set tighten to bounds
@@ -101,6 +129,22 @@ class Context:
         """
         self._tighten_to_bounds = tighten
 
+    def set_max_download_workers(self, workers: int) -> None:
+        """Set the maximum number of parallel tile downloads
+
+        Parameters:
+            workers (int): maximum number of parallel tile downloads
+
+        Raises:
+            ValueError: raises value error for a non-positive number of workers
+        """
+        if workers < 1:
+            raise ValueError(f"Bad number of download workers: {workers}")
+        self._max_download_workers = workers
+        if self._download_executor is not None:
+            self._download_executor.shutdown(wait=False)
+            self._download_executor = None
+
     def add_object(self, obj: Object) -> None:
         """Add object for the static map (e.g. line, area, marker)
 
@@ -121,7 +165,7 @@ class Context:
             height (int): height of static map
 
         Returns:
-            cairo.ImageSurface: cairo image
+            cairo.ImageSurface: cairo image (FORMAT_RGB24 if a background color is set, FORMAT_ARGB32 otherwise)
 
         Raises:
             RuntimeError: raises runtime error if cairo is not available
@@ -137,15 +181,32 @@ class Context:
 
         trans = Transformer(width, height, zoom, center, self._tile_provider.tile_size())
 
-        renderer = CairoRenderer(trans)
+        # the background is painted opaque => the image doesn't need an alpha channel
+        alpha = self._background_color is None
+        surfaces = self._cairo_surface_pool.get((width, height, alpha))
+        renderer = CairoRenderer(trans, self._cairo_tile_cache, surfaces.pop() if surfaces else None, alpha)
         renderer.render_background(self._background_color)
-        renderer.render_tiles(self._fetch_tile, self._objects, self._tighten_to_bounds)
+        # the renderer downloads and decodes the tiles in the context's thread pool itself => no prefetching
+        renderer.render_tiles(self._fetch_tile, self._objects, self._tighten_to_bounds, executor=self._executor())
         renderer.render_objects(self._objects, self._tighten_to_bounds)
         if attribution:
             renderer.render_attribution(self._tile_provider.attribution())
 
         return renderer.image_surface()
 
+    def release_cairo_surface(self, surface: typing.Any) -> None:
+        """Hand back an image returned by render_cairo, so that later renderings of the same size can reuse it
+
+        The surface must not be used by the caller afterwards, since it will be overwritten.
+
+        Parameters:
+            surface (cairo.ImageSurface): cairo image returned by render_cairo
+        """
+        key = (surface.get_width(), surface.get_height(), CairoRenderer.has_alpha(surface))
+        surfaces = self._cairo_surface_pool.setdefault(key, [])
+        if all(s is not surface for s in surfaces):
+            surfaces.append(surface)
+
     def render_pillow(self, width: int, height: int, attribution: bool=True) -> PIL_Image:
         """Render context using PILLOW
 
@@ -165,9 +226,14 @@ class Context:
 
         trans = Transformer(width, height, zoom, center, self._tile_provider.tile_size())
 
+        self._prefetch(trans)
+
         renderer = PillowRenderer(trans)
         renderer.render_background(self._background_color)
-        renderer.render_tiles(self._fetch_tile, self._objects, self._tighten_to_bounds)
+        try:
+            renderer.render_tiles(self._fetch_tile, self._objects, self._tighten_to_bounds)
+        finally:
+            self._pending_tiles.clear()
         renderer.render_objects(self._objects, self._tighten_to_bounds)
         if attribution:
             renderer.render_attribution(self._tile_provider.attribution())
@@ -193,9 +259,14 @@ class Context:
 
         trans = Transformer(width, height, zoom, center, self._tile_provider.tile_size())
 
+        self._prefetch(trans)
+
         renderer = SvgRenderer(trans)
         renderer.render_background(self._background_color)
-        renderer.render_tiles(self._fetch_tile, self._objects, self._tighten_to_bounds)
+        try:
+            renderer.render_tiles(self._fetch_tile, self._objects, self._tighten_to_bounds)
+        finally:
+            self._pending_tiles.clear()
         renderer.render_objects(self._objects, self._tighten_to_bounds)
         renderer.render_attribution(self._tile_provider.attribution())
 
@@ -339,7 +410,31 @@ class Context:
 
         return trans.pixel2ll((max_x + min_x) * 0.5, (max_y + min_y) * 0.5)
 
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._download_executor is None:
+            self._download_executor = ThreadPoolExecutor(max_workers=self._max_download_workers)
+        return self._download_executor
+
+    def _prefetch(self, trans: Transformer) -> None:
+        """Start downloading all tiles covering the image in the background
+
+        Parameters:
+            trans (Transformer): transformer of the image
+        """
+        self._pending_tiles = {}
+        executor = self._executor()
+        for _, _, x, y in trans.tiles():
+            key = (trans.zoom(), x, y)
+            if key in self._pending_tiles:
+                continue
+            self._pending_tiles[key] = executor.submit(
+                self._tile_downloader.get, self._tile_provider, self._cache_dir, *key
+            )
+
     def _fetch_tile(self, z: int, x: int, y: int) -> typing.Optional[bytes]:
+        future = self._pending_tiles.pop((z, x, y), None)
+        if future is not None:
+            return future.result()
         return self._tile_downloader.get(self._tile_provider, self._cache_dir, z, x, y)
 
     def _clamp_zoom(self, zoom: typing.Optional[int]) -> typing.Optional[int]:
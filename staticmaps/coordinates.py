@@ -1,6 +1,7 @@
 """py-staticmaps - Coordinates"""
 # Copyright (c) 2020 Florian Pigorsch; see /LICENSE for licensing information
 
+import math
 import typing
 
 import s2sphere  # type: ignore
@@ -19,6 +20,29 @@ def create_latlng(lat: float, lng: float) -> s2sphere.LatLng:
     return s2sphere.LatLng.from_degrees(lat, lng)
 
 
+def create_latlngs(lats: typing.Sequence[float], lngs: typing.Sequence[float]) -> typing.List[s2sphere.LatLng]:
+    """Create a list of LatLng objects from sequences of latitude and longitude values
+
+    This is a convenience only and hardly faster than calling create_latlng for each value; to create a line from
+    many coordinates, use Line.from_degrees, which doesn't create LatLng objects at all.
+
+    Parameters:
+        lats (typing.Sequence[float]): latitudes
+        lngs (typing.Sequence[float]): longitudes
+
+    Returns:
+        typing.List[s2sphere.LatLng]: list of LatLng objects
+
+    Raises:
+        ValueError: raises a value error if the number of latitudes and longitudes differ
+    """
+    if len(lats) != len(lngs):
+        raise ValueError(f"Number of latitudes ({len(lats)}) and longitudes ({len(lngs)}) differ")
+    radians = math.radians
+    latlng = s2sphere.LatLng
+    return [latlng(radians(lat), radians(lng)) for lat, lng in zip(lats, lngs)]
+
+
 def parse_latlng(s: str) -> s2sphere.LatLng:
     """Parse a string with comma separated latitude,longitude values and create a LatLng object from float values
 
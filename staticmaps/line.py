@@ -3,6 +3,7 @@
 
 import math
 import typing
+from array import array
 
 import s2sphere  # type: ignore
 from geographiclib.geodesic import Geodesic  # type: ignore
@@ -10,10 +11,15 @@ from geographiclib.geodesic import Geodesic  # type: ignore
 from .bounds import Bounds
 from .cairo_renderer import CairoRenderer
 from .color import RED, Color
-from .coordinates import create_latlng
 from .object import Object, PixelBoundsT
 from .pillow_renderer import PillowRenderer
 from .svg_renderer import SvgRenderer
+from .transformer import Transformer
+
+PixelsT = typing.List[typing.Tuple[float, float]]
+
+# polylines with at most this many points (after dropping close points) are always simplified with RDP
+RDP_MAX_SPARSE_POINTS = 1000
 
 
 class Line(Bounds):
@@ -21,17 +27,80 @@ class Line(Bounds):
     Line A line object
     """
 
-    def __init__(self, latlngs: typing.List[s2sphere.LatLng], color: Color = RED, width: int = 2) -> None:
+    def __init__(
+        self, latlngs: typing.List[s2sphere.LatLng], color: Color = RED, width: int = 2, simplify_px: float = 0.5
+    ) -> None:
         Object.__init__(self)
         if latlngs is None or len(latlngs) < 2:
             raise ValueError("Trying to create line with less than 2 coordinates")
+        self._init_line(
+            array("d", (latlng.lat().radians for latlng in latlngs)),
+            array("d", (latlng.lng().radians for latlng in latlngs)),
+            color,
+            width,
+            simplify_px,
+        )
+
+    @classmethod
+    def from_degrees(
+        cls,
+        lats: typing.Sequence[float],
+        lngs: typing.Sequence[float],
+        color: Color = RED,
+        width: int = 2,
+        simplify_px: float = 0.5,
+    ) -> "Line":
+        """Create a line from latitude and longitude values (in degrees) without creating LatLng objects
+
+        Parameters:
+            lats (typing.Sequence[float]): latitudes in degrees
+            lngs (typing.Sequence[float]): longitudes in degrees
+            color (Color): color of the line
+            width (int): width of the line
+            simplify_px (float): simplification tolerance of the line in pixels, 0 to disable simplification
+
+        Returns:
+            Line: line object
+
+        Raises:
+            TypeError: raises type error if called on a subclass, since it would bypass the subclass' constructor
+            ValueError: raises value error if the sequences differ in length or contain less than 2 values
+        """
+        if cls is not Line:
+            raise TypeError(f"{cls.__name__} cannot be created with Line.from_degrees")
+        if len(lats) != len(lngs):
+            raise ValueError(f"Number of latitudes ({len(lats)}) and longitudes ({len(lngs)}) differ")
+        if len(lats) < 2:
+            raise ValueError("Trying to create line with less than 2 coordinates")
+        line = Line.__new__(Line)
+        Object.__init__(line)
+        radians = math.radians
+        line._init_line(array("d", map(radians, lats)), array("d", map(radians, lngs)), color, width, simplify_px)
+        return line
+
+    def _init_line(self, lats: array, lngs: array, color: Color, width: int, simplify_px: float) -> None:
         if width < 0:
             raise ValueError(f"'width' must be >= 0: {width}")
+        if simplify_px < 0:
+            raise ValueError(f"'simplify_px' must be >= 0: {simplify_px}")
 
-        self._latlngs = latlngs
+        # store the coordinates (in radians) as two flat arrays instead of a list of LatLng objects
+        self._lats = lats
+        self._lngs = lngs
         self._color = color
         self._width = width
-        self._interpolation_cache: typing.Optional[typing.List[s2sphere.LatLng]] = None
+        self._simplify_px = simplify_px
+        self._interpolation_cache: typing.Optional[typing.Tuple[array, array]] = None
+        self._bounds_cache: typing.Optional[s2sphere.LatLngRect] = None
+        self._pixels_cache: typing.Optional[typing.Tuple[Transformer, PixelsT]] = None
+
+    def latlngs(self) -> typing.List[s2sphere.LatLng]:
+        """Return the coordinates of the line
+
+        Returns:
+            typing.List[s2sphere.LatLng]: list of LatLng
+        """
+        return [s2sphere.LatLng(lat, lng) for lat, lng in zip(self._lats, self._lngs)]
 
     def color(self) -> Color:
         """Return color of the line
@@ -49,16 +118,26 @@ class Line(Bounds):
         """
         return self._width
 
+    def simplify_px(self) -> float:
+        """Return the simplification tolerance of the line
+
+        Returns:
+            float: maximum deviation (in pixels) of the rendered line from its points, 0 to disable simplification
+        """
+        return self._simplify_px
+
     def bounds(self) -> s2sphere.LatLngRect:
         """Return bounds of line
 
         Returns:
             s2sphere.LatLngRect: bounds of line
         """
-        b = s2sphere.LatLngRect()
-        for latlng in self.interpolate():
-            b = b.union(s2sphere.LatLngRect.from_point(latlng.normalized()))
-        return b
+        if self._bounds_cache is None:
+            b = s2sphere.LatLngRect()
+            for lat, lng in zip(*self.interpolate_radians()):
+                b = b.union(s2sphere.LatLngRect.from_point(s2sphere.LatLng(lat, lng).normalized()))
+            self._bounds_cache = b
+        return self._bounds_cache
 
     def extra_pixel_bounds(self) -> PixelBoundsT:
         """Return extra pixel bounds from line
@@ -68,61 +147,108 @@ class Line(Bounds):
         """
         return int(0.5 * self._width), int(0.5 * self._width), int(0.5 * self._width), int(0.5 * self._width)
 
+    def pixel_bounds(self, trans: Transformer) -> typing.Optional[typing.Tuple[float, float, float, float]]:
+        """Return the pixel rect (left, top, right, bottom) covered by the rendered line, used for culling.
+
+        Unlike pixel_rect, this uses the actual (possibly unrolled) points that are rendered.
+
+        Parameters:
+            trans (Transformer): transformer
+
+        Returns:
+            typing.Optional[typing.Tuple[float, float, float, float]]: pixel rectangle of line
+        """
+        xys = self.pixels(trans)
+        xs = [x for x, _ in xys]
+        ys = [y for _, y in xys]
+        l, t, r, b = self.extra_pixel_bounds()
+        return min(xs) - l, min(ys) - t, max(xs) + r, max(ys) + b
+
     def interpolate(self) -> typing.List[s2sphere.LatLng]:
         """Interpolate bounds
 
         Returns:
             typing.List[s2sphere.LatLng]: list of LatLng
         """
+        return [s2sphere.LatLng(lat, lng) for lat, lng in zip(*self.interpolate_radians())]
+
+    def interpolate_radians(self) -> typing.Tuple[array, array]:
+        """Interpolate bounds, returning the coordinates as flat arrays
+
+        Returns:
+            typing.Tuple[array, array]: latitudes and longitudes (in radians) of the interpolated line
+        """
         if self._interpolation_cache is not None:
             return self._interpolation_cache
-        assert len(self._latlngs) >= 2
-        self._interpolation_cache = []
+        assert len(self._lats) >= 2
+        lats = array("d", [self._lats[0]])
+        lngs = array("d", [self._lngs[0]])
         threshold = 2 * math.pi / 360
-        last = self._latlngs[0]
-        self._interpolation_cache.append(last)
+        last_lat, last_lng = self._lats[0], self._lngs[0]
         geod = Geodesic.WGS84
-        for current in self._latlngs[1:]:
+        for lat, lng in zip(self._lats[1:], self._lngs[1:]):
             # don't perform geodesic interpolation if the longitudinal distance is < threshold = 1°
-            dlng = current.lng().radians - last.lng().radians
+            dlng = lng - last_lng
             while dlng < 0:
                 dlng += 2 * math.pi
             while dlng >= math.pi:
                 dlng -= 2 * math.pi
             if abs(dlng) < threshold:
-                self._interpolation_cache.append(current)
-                last = current
+                lats.append(lat)
+                lngs.append(lng)
+                last_lat, last_lng = lat, lng
                 continue
             # geodesic interpolation
             line = geod.InverseLine(
-                last.lat().degrees,
-                last.lng().degrees,
-                current.lat().degrees,
-                current.lng().degrees,
+                math.degrees(last_lat),
+                math.degrees(last_lng),
+                math.degrees(lat),
+                math.degrees(lng),
             )
             n = 2 + math.ceil(line.a13)
-            for i in range(1, n+1):
+            for i in range(1, n + 1):
                 a = (i * line.a13) / n
                 g = line.ArcPosition(a, Geodesic.LATITUDE | Geodesic.LONGITUDE | Geodesic.LONG_UNROLL)
-                self._interpolation_cache.append(create_latlng(g["lat2"], g["lon2"]))
-            last = current
+                lats.append(math.radians(g["lat2"]))
+                lngs.append(math.radians(g["lon2"]))
+            last_lat, last_lng = lat, lng
+        self._interpolation_cache = (lats, lngs)
         return self._interpolation_cache
 
+    def pixels(self, trans: Transformer) -> typing.List[typing.Tuple[float, float]]:
+        """Return the pixel values of the interpolated line
+
+        The values are cached for the most recent transformer, since culling and rendering project the line several
+        times during a single rendering. The returned list must not be modified.
+
+        Parameters:
+            trans (Transformer): transformer
+
+        Returns:
+            typing.List[typing.Tuple[float, float]]: pixel values of the interpolated line
+        """
+        # transformers are immutable => the identity is a sufficient cache key
+        if self._pixels_cache is not None and self._pixels_cache[0] is trans:
+            return self._pixels_cache[1]
+        xys = trans.radians2pixels(*self.interpolate_radians())
+        self._pixels_cache = (trans, xys)
+        return xys
+
     def calculate_final_bearing(self) -> float:
         """ Calculate the final bearing of the line. Like the direction an aircraft would be pointing after it Flew from Point A to Point B
 
         Returns:
             float: The final bearing in degrees.
         """
-        if len(self._latlngs) < 2:
+        if len(self._lats) < 2:
             raise ValueError("Not enough coordinates to calculate bearing.")
 
         # Ensure the interpolation cache is populated
-        interpolated_points = self.interpolate()
+        interpolated_lats, interpolated_lngs = self.interpolate_radians()
 
         # Retrieve the last two points from the interpolation
-        end_point = self._latlngs[-1]
-        second_last_point = interpolated_points[0]
+        end_point = s2sphere.LatLng(self._lats[-1], self._lngs[-1])
+        second_last_point = s2sphere.LatLng(interpolated_lats[0], interpolated_lngs[0])
 
         # Calculate the final bearing using the Geodesic library
         geod = Geodesic.WGS84
@@ -136,6 +262,82 @@ class Line(Bounds):
         # Return the final bearing (azi1)
         return (g['azi1'] + 180) % 360
 
+    @staticmethod
+    def simplify(
+        xys: typing.List[typing.Tuple[float, float]], epsilon: float
+    ) -> typing.List[typing.Tuple[float, float]]:
+        """Simplify a polyline, so that no removed point is further than epsilon from the simplified polyline
+
+        A linear pass first drops points too close to their predecessor; the Ramer-Douglas-Peucker algorithm then
+        only runs if the remaining points are still denser than the pixels, since it is expensive and doesn't remove
+        much otherwise. Both passes use half of the tolerance.
+
+        Parameters:
+            xys (typing.List[typing.Tuple[float, float]]): pixel values of the polyline
+            epsilon (float): maximum distance of removed points from the simplified polyline, 0 to disable
+
+        Returns:
+            typing.List[typing.Tuple[float, float]]: pixel values of the simplified polyline
+        """
+        if epsilon <= 0 or len(xys) < 3:
+            return xys
+        tolerance = 0.5 * epsilon
+        tolerance2 = tolerance * tolerance
+        reduced = [xys[0]]
+        last_x, last_y = xys[0]
+        for xy in xys[1:-1]:
+            dx = xy[0] - last_x
+            dy = xy[1] - last_y
+            d2 = dx * dx + dy * dy
+            if d2 >= tolerance2:
+                reduced.append(xy)
+                last_x, last_y = xy
+        reduced.append(xys[-1])
+        if len(reduced) > RDP_MAX_SPARSE_POINTS and 2 * len(reduced) > len(xys):
+            # the points are not (much) denser than the tolerance => RDP would hardly remove any of them
+            return reduced
+        return Line._rdp(reduced, tolerance)
+
+    @staticmethod
+    def _rdp(xys: typing.List[typing.Tuple[float, float]], epsilon: float) -> typing.List[typing.Tuple[float, float]]:
+        n = len(xys)
+        if n < 3:
+            return xys
+        epsilon2 = epsilon * epsilon
+        keep = [False] * n
+        keep[0] = keep[-1] = True
+        stack = [(0, n - 1)]
+        while stack:
+            first, last = stack.pop()
+            x1, y1 = xys[first]
+            x2, y2 = xys[last]
+            dx = x2 - x1
+            dy = y2 - y1
+            d2 = dx * dx + dy * dy
+            max_dist2 = 0.0
+            max_index = first
+            for i in range(first + 1, last):
+                x, y = xys[i]
+                # squared distance to the segment (not the infinite line), so that back-and-forth spikes are kept
+                ex = x - x1
+                ey = y - y1
+                dot = ex * dx + ey * dy
+                if dot <= 0:
+                    dist2 = ex * ex + ey * ey
+                elif dot >= d2:
+                    dist2 = (x - x2) * (x - x2) + (y - y2) * (y - y2)
+                else:
+                    cross = ex * dy - ey * dx
+                    dist2 = cross * cross / d2
+                if dist2 > max_dist2:
+                    max_dist2 = dist2
+                    max_index = i
+            if max_dist2 > epsilon2:
+                keep[max_index] = True
+                stack.append((first, max_index))
+                stack.append((max_index, last))
+        return [xy for xy, k in zip(xys, keep) if k]
+
     def render_pillow(self, renderer: PillowRenderer) -> None:
         """Render line using PILLOW
 
@@ -144,10 +346,7 @@ class Line(Bounds):
         """
         if self.width() == 0:
             return
-        xys = [
-            (x + renderer.offset_x(), y)
-            for (x, y) in [renderer.transformer().ll2pixel(latlng) for latlng in self.interpolate()]
-        ]
+        xys = [(x + renderer.offset_x(), y) for (x, y) in self.pixels(renderer.transformer())]
         renderer.draw().line(xys, self.color().int_rgba(), self.width())
 
     def render_svg(self, renderer: SvgRenderer) -> None:
@@ -158,8 +357,8 @@ class Line(Bounds):
         """
         if self.width() == 0:
             return
-        xys = [renderer.transformer().ll2pixel(latlng) for latlng in self.interpolate()]
-        polyline = renderer.drawing().polyline(
+        xys = self.simplify(self.pixels(renderer.transformer()), self.simplify_px())
+        polyline = renderer.polyline_path(
             xys,
             fill="none",
             stroke=self.color().hex_rgb(),
@@ -168,6 +367,47 @@ class Line(Bounds):
         )
         renderer.group().add(polyline)
 
+    def cairo_batch_key(self) -> typing.Optional[typing.Hashable]:
+        """Return a key for batched rendering using cairo
+
+        Opaque lines with the same color and width are stroked together as a single cairo path.
+
+        Returns:
+            typing.Optional[typing.Hashable]: batch key, None if the line has to be rendered on its own
+        """
+        # subclasses drawing something else (e.g. areas) must not be merged into a plain stroke
+        if type(self).render_cairo is not Line.render_cairo:
+            return None
+        if self.width() == 0 or self.color().float_a() < 1.0:
+            return None
+        return Line, self.color().int_rgba(), self.width()
+
+    def render_cairo_batch(self, renderer: CairoRenderer, objects: typing.List[Object]) -> None:
+        """Render a batch of lines with a single stroke using cairo
+
+        Parameters:
+            renderer (CairoRenderer): cairo renderer
+            objects (typing.List[Object]): lines of the batch (including this line)
+        """
+        renderer.context().set_source_rgba(*self.color().float_rgba())
+        renderer.context().set_line_width(self.width())
+        renderer.context().new_path()
+        for obj in objects:
+            assert isinstance(obj, Line)
+            obj.cairo_path(renderer)
+        renderer.context().stroke()
+
+    def cairo_path(self, renderer: CairoRenderer) -> None:
+        """Add the line as a new sub path to the current cairo path
+
+        Parameters:
+            renderer (CairoRenderer): cairo renderer
+        """
+        xys = self.simplify(self.pixels(renderer.transformer()), self.simplify_px())
+        renderer.context().move_to(*xys[0])
+        for x, y in xys[1:]:
+            renderer.context().line_to(x, y)
+
     def render_cairo(self, renderer: CairoRenderer) -> None:
         """Render line using cairo
 
@@ -176,10 +416,8 @@ class Line(Bounds):
         """
         if self.width() == 0:
             return
-        xys = [renderer.transformer().ll2pixel(latlng) for latlng in self.interpolate()]
         renderer.context().set_source_rgba(*self.color().float_rgba())
         renderer.context().set_line_width(self.width())
         renderer.context().new_path()
-        for x, y in xys:
-            renderer.context().line_to(x, y)
+        self.cairo_path(renderer)
         renderer.context().stroke()
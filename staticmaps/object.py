@@ -85,6 +85,26 @@ class Object(ABC):
         m = "render_cairo"
         raise RuntimeError(f"Cannot render to {t} since the class '{c}' doesn't implement the '{m}' method.")
 
+    def cairo_batch_key(self) -> typing.Optional[typing.Hashable]:
+        """Return a key for batched rendering using cairo
+
+        Consecutive objects with equal (non-None) keys are rendered together via render_cairo_batch.
+
+        Returns:
+            typing.Optional[typing.Hashable]: batch key, None if the object has to be rendered on its own
+        """
+        return None
+
+    def render_cairo_batch(self, renderer: CairoRenderer, objects: typing.List["Object"]) -> None:
+        """Render a batch of objects sharing this object's batch key using cairo
+
+        Parameters:
+            renderer (CairoRenderer): cairo renderer
+            objects (typing.List["Object"]): objects of the batch (including this object)
+        """
+        for obj in objects:
+            obj.render_cairo(renderer)
+
     def pixel_rect(self, trans: Transformer) -> typing.Tuple[float, float, float, float]:
         """Return the pixel rect (left, top, right, bottom) of the object when using the supplied Transformer.
 
@@ -100,6 +120,34 @@ class Object(ABC):
         l, t, r, b = self.extra_pixel_bounds()
         return nw_x - l, nw_y - t, se_x + r, se_y + b
 
+    def pixel_bounds(self, trans: Transformer) -> typing.Optional[typing.Tuple[float, float, float, float]]:
+        """Return the pixel rect (left, top, right, bottom) covered by the rendered object, used for culling.
+
+        Parameters:
+            trans (Transformer): transformer
+
+        Returns:
+            typing.Optional[typing.Tuple[float, float, float, float]]: pixel rectangle of object, None if unknown
+        """
+        l, t, r, b = self.pixel_rect(trans)
+        # objects crossing the antimeridian yield inverted rects => no reliable bounds
+        if l > r or t > b:
+            return None
+        return l, t, r, b
+
+    def opaque_pixel_rect(self, trans: Transformer) -> typing.Optional[typing.Tuple[float, float, float, float]]:
+        """Return a pixel rect (left, top, right, bottom) that is completely covered by opaque paint of the object
+
+        Used to skip tiles hidden behind the object; the rect may be smaller than the covered region, but never larger.
+
+        Parameters:
+            trans (Transformer): transformer
+
+        Returns:
+            typing.Optional[typing.Tuple[float, float, float, float]]: opaque pixel rectangle, None if there is none
+        """
+        return None
+
     def bounds_epb(self, trans: Transformer) -> s2sphere.LatLngRect:
         """Return the object bounds including extra pixel bounds of the object when using the supplied Transformer.
 
@@ -4,7 +4,6 @@
 # Copyright (c) 2020 Florian Pigorsch; see /LICENSE for licensing information
 
 import io
-import math
 import typing
 
 # import s2sphere  # type: ignore
@@ -78,9 +77,8 @@ class PillowRenderer(Renderer):
             objects (typing.List["Object"]): objects of static map
             tighten (bool): tighten to boundaries
         """
-        x_count = math.ceil(self._trans.image_width() / (2 * self._trans.world_width()))
         for obj in objects:
-            for p in range(-x_count, x_count + 1):
+            for p in self.world_copies([obj]):
                 self._offset_x = p * self._trans.world_width()
                 obj.render_pillow(self)
 
@@ -107,25 +105,17 @@ class PillowRenderer(Renderer):
             objects (typing.List["Object"]): objects of static map
             tighten (bool): tighten to boundaries
         """
-        for yy in range(0, self._trans.tiles_y()):
-            y = self._trans.first_tile_y() + yy
-            if y < 0 or y >= self._trans.number_of_tiles():
-                continue
-            for xx in range(0, self._trans.tiles_x()):
-                x = (self._trans.first_tile_x() + xx) % self._trans.number_of_tiles()
-                try:
-                    tile_img = self.fetch_tile(download, x, y)
-                    if tile_img is None:
-                        continue
-                    self._image.paste(
-                        tile_img,
-                        (
-                            int(xx * self._trans.tile_size() + self._trans.tile_offset_x()),
-                            int(yy * self._trans.tile_size() + self._trans.tile_offset_y()),
-                        ),
-                    )
-                except RuntimeError:
-                    pass
+        ts = self._trans.tile_size()
+        ox = self._trans.tile_offset_x()
+        oy = self._trans.tile_offset_y()
+        for xx, yy, x, y in self._trans.tiles():
+            try:
+                tile_img = self.fetch_tile(download, x, y)
+                if tile_img is None:
+                    continue
+                self._image.paste(tile_img, (int(xx * ts + ox), int(yy * ts + oy)))
+            except RuntimeError:
+                pass
 
     def render_attribution(self, attribution: typing.Optional[str]) -> None:
         """Render attribution from given tiles provider
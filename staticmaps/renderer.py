@@ -1,6 +1,7 @@
 """py-staticmaps - renderer"""
 # Copyright (c) 2020 Florian Pigorsch; see /LICENSE for licensing information
 
+import math
 import typing
 from abc import ABC, abstractmethod
 
@@ -104,6 +105,61 @@ class Renderer(ABC):
             attribution (typing.Optional[str]): Attribution for the given tiles provider
         """
 
+    def world_copies(self, objects: typing.List["Object"]) -> typing.List[int]:
+        """Return the world copies (as multiples of the world width) in which the given objects are visible
+
+        Parameters:
+            objects (typing.List["Object"]): objects rendered together
+
+        Returns:
+            typing.List[int]: offsets of the visible world copies, in world widths
+        """
+        x_count = math.ceil(self._trans.image_width() / (2 * self._trans.world_width()))
+        copies = list(range(-x_count, x_count + 1))
+        bounds = [obj.pixel_bounds(self._trans) for obj in objects]
+        if any(b is None for b in bounds):
+            return copies
+        left = min(pb[0] for pb in bounds if pb is not None)
+        top = min(pb[1] for pb in bounds if pb is not None)
+        right = max(pb[2] for pb in bounds if pb is not None)
+        bottom = max(pb[3] for pb in bounds if pb is not None)
+        width, height = self._trans.image_size()
+        if bottom < 0 or top > height:
+            return []
+        ww = self._trans.world_width()
+        return [p for p in copies if right + p * ww >= 0 and left + p * ww <= width]
+
+    def visible_tiles(self, objects: typing.List["Object"]) -> typing.List[typing.Tuple[int, int, int, int]]:
+        """Return the tiles covering the image that are not completely hidden behind opaque objects
+
+        Parameters:
+            objects (typing.List["Object"]): objects of static map
+
+        Returns:
+            typing.List[typing.Tuple[int, int, int, int]]: position (xx, yy) in the tile grid of the image and
+                tile index (x, y) of each visible tile
+        """
+        tiles = self._trans.tiles()
+        rects = [rect for rect in (obj.opaque_pixel_rect(self._trans) for obj in objects) if rect is not None]
+        if not rects:
+            return tiles
+        width, height = self._trans.image_size()
+        ts = self._trans.tile_size()
+        ox = self._trans.tile_offset_x()
+        oy = self._trans.tile_offset_y()
+        visible = []
+        for tile in tiles:
+            x0 = int(tile[0] * ts + ox)
+            y0 = int(tile[1] * ts + oy)
+            # only the part of the tile inside the image needs to be covered
+            left, top, right, bottom = max(0, x0), max(0, y0), min(width, x0 + ts), min(height, y0 + ts)
+            if not any(
+                r_left <= left and r_top <= top and right <= r_right and bottom <= r_bottom
+                for r_left, r_top, r_right, r_bottom in rects
+            ):
+                visible.append(tile)
+        return visible
+
     def get_object_bounds(self, objects: typing.List["Object"]) -> s2sphere.LatLngRect:
         """Return "cumulated" boundaries of all objects
 
@@ -49,6 +49,29 @@ class SvgRenderer(Renderer):
         assert self._group is not None
         return self._group
 
+    def polyline_path(
+        self, xys: typing.List[typing.Tuple[float, float]], closed: bool = False, **extra: typing.Any
+    ) -> svgwrite.path.Path:
+        """Create an svg path for a polyline (or polygon)
+
+        The path data is formatted in one go and not validated by svgwrite, which is considerably faster for long
+        polylines than handing the points to svgwrite's polyline/polygon elements.
+
+        Parameters:
+            xys (typing.List[typing.Tuple[float, float]]): pixel values of the polyline
+            closed (bool): close the path (polygon)
+            extra (typing.Any): extra svg attributes of the path
+
+        Returns:
+            svgwrite.path.Path: svg path
+        """
+        d = "M" + " L".join([f"{x:.2f},{y:.2f}" for x, y in xys])
+        if closed:
+            d += " Z"
+        # a standalone element (not created via the drawing's factory), so that disabling the validation doesn't
+        # affect other elements
+        return svgwrite.path.Path(d=d, debug=False, **extra)
+
     def render_objects(
         self,
         objects: typing.List["Object"],
@@ -97,28 +120,23 @@ class SvgRenderer(Renderer):
             tighten (bool): tighten to boundaries
         """
         self._group = self._draw.g(clip_path="url(#page)")
-        for yy in range(0, self._trans.tiles_y()):
-            y = self._trans.first_tile_y() + yy
-            if y < 0 or y >= self._trans.number_of_tiles():
-                continue
-            for xx in range(0, self._trans.tiles_x()):
-                x = (self._trans.first_tile_x() + xx) % self._trans.number_of_tiles()
-                try:
-                    tile_img = self.fetch_tile(download, x, y)
-                    if tile_img is None:
-                        continue
-                    self._group.add(
-                        self._draw.image(
-                            tile_img,
-                            insert=(
-                                int(xx * self._trans.tile_size() + self._trans.tile_offset_x()),
-                                int(yy * self._trans.tile_size() + self._trans.tile_offset_y()),
-                            ),
-                            size=(self._trans.tile_size(), self._trans.tile_size()),
-                        )
+        ts = self._trans.tile_size()
+        ox = self._trans.tile_offset_x()
+        oy = self._trans.tile_offset_y()
+        for xx, yy, x, y in self._trans.tiles():
+            try:
+                tile_img = self.fetch_tile(download, x, y)
+                if tile_img is None:
+                    continue
+                self._group.add(
+                    self._draw.image(
+                        tile_img,
+                        insert=(int(xx * ts + ox), int(yy * ts + oy)),
+                        size=(ts, ts),
                     )
-                except RuntimeError:
-                    pass
+                )
+            except RuntimeError:
+                pass
         tiles_group = self._tighten_to_boundary(self._group, objects, tighten)
         self._draw.add(tiles_group)
         self._group = None
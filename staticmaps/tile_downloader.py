@@ -3,15 +3,25 @@
 
 import os
 import pathlib
+import tempfile
+import threading
+import time
 import typing
+from urllib.parse import urlparse
 
 import requests  # type: ignore
 import slugify  # type: ignore
+from requests.adapters import HTTPAdapter  # type: ignore
+from urllib3.util.retry import Retry  # type: ignore
 
 from .meta import GITHUB_URL, LIB_NAME, VERSION
 from .tile_provider import TileProvider
 
 REQUEST_TIMEOUT = 600
+MAX_REQUESTS_PER_SECOND = 10.0
+# at least the number of parallel downloads of a context, so that a rendering isn't throttled right away
+MAX_REQUEST_BURST = 16
+MAX_CACHE_AGE = 30 * 24 * 60 * 60
 
 
 class TileDownloader:
@@ -20,6 +30,23 @@ class TileDownloader:
     def __init__(self) -> None:
         self._user_agent = f"Mozilla/5.0+(compatible; {LIB_NAME}/{VERSION}; {GITHUB_URL})"
         self._sanitized_name_cache: typing.Dict[str, str] = {}
+        self._max_requests_per_second = MAX_REQUESTS_PER_SECOND
+        self._max_cache_age: typing.Optional[float] = MAX_CACHE_AGE
+        self._max_request_burst = MAX_REQUEST_BURST
+        # token bucket per host: available tokens (negative when requests are waiting) and time of the last update
+        self._request_tokens: typing.Dict[str, typing.Tuple[float, float]] = {}
+        self._throttle_lock = threading.Lock()
+        # one session for all downloads, so that connections to the tile servers are kept alive and reused
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=3, backoff_factor=0.3, status_forcelist=[429, 502, 503, 504], raise_on_status=False
+            ),
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
 
     def set_user_agent(self, user_agent: str) -> None:
         """Set the user agent for the downloader
@@ -29,6 +56,45 @@ class TileDownloader:
         """
         self._user_agent = user_agent
 
+    def set_max_requests_per_second(self, max_requests_per_second: float) -> None:
+        """Set the maximum (sustained) number of requests per second sent to a single tile server
+
+        Parameters:
+            max_requests_per_second (float): maximum number of requests per second and host
+
+        Raises:
+            ValueError: raises a value error for a non-positive rate
+        """
+        if max_requests_per_second <= 0:
+            raise ValueError(f"Bad number of requests per second: {max_requests_per_second}")
+        self._max_requests_per_second = max_requests_per_second
+
+    def set_max_request_burst(self, max_request_burst: int) -> None:
+        """Set the maximum number of requests sent to a single tile server at once, before throttling sets in
+
+        Parameters:
+            max_request_burst (int): maximum number of requests in a burst
+
+        Raises:
+            ValueError: raises a value error for a non-positive number of requests
+        """
+        if max_request_burst < 1:
+            raise ValueError(f"Bad request burst: {max_request_burst}")
+        self._max_request_burst = max_request_burst
+
+    def set_max_cache_age(self, max_cache_age: typing.Optional[float]) -> None:
+        """Set the maximum age of cached tiles; older tiles are downloaded again
+
+        Parameters:
+            max_cache_age (typing.Optional[float]): maximum age in seconds, None to never expire cached tiles
+
+        Raises:
+            ValueError: raises a value error for a negative age
+        """
+        if max_cache_age is not None and max_cache_age < 0:
+            raise ValueError(f"Bad maximum cache age: {max_cache_age}")
+        self._max_cache_age = max_cache_age
+
     def get(self, provider: TileProvider, cache_dir: str, zoom: int, x: int, y: int) -> typing.Optional[bytes]:
         """Get tiles
 
@@ -43,30 +109,76 @@ class TileDownloader:
             typing.Optional[bytes]: tiles
 
         Raises:
-            RuntimeError: raises a runtime error if the server response status is not 200
+            RuntimeError: raises a runtime error if the server response status is not 200 (and no expired tile
+                is cached)
         """
         file_name = None
         if cache_dir is not None:
             file_name = self.cache_file_name(provider, cache_dir, zoom, x, y)
-            if os.path.isfile(file_name):
-                with open(file_name, "rb") as f:
-                    return f.read()
+            if self._is_cached(file_name):
+                return self._read_cache_file(file_name)
 
         url = provider.url(zoom, x, y)
         if url is None:
             return None
-        res = requests.get(url, headers={"user-agent": self._user_agent}, timeout=REQUEST_TIMEOUT)
-        if res.status_code == 200:
-            data = res.content
-        else:
-            raise RuntimeError(f"fetch {url} yields {res.status_code}")
+        try:
+            data = self._download(url)
+        except (requests.RequestException, RuntimeError):
+            # an expired tile is better than no tile at all (e.g. when offline)
+            if file_name is not None and os.path.isfile(file_name):
+                return self._read_cache_file(file_name)
+            raise
 
         if file_name is not None:
-            pathlib.Path(os.path.dirname(file_name)).mkdir(parents=True, exist_ok=True)
-            with open(file_name, "wb") as f:
-                f.write(data)
+            self._write_cache_file(file_name, data)
         return data
 
+    def _download(self, url: str) -> bytes:
+        self._throttle(url)
+        res = self._session.get(url, headers={"user-agent": self._user_agent}, timeout=REQUEST_TIMEOUT)
+        if res.status_code != 200:
+            raise RuntimeError(f"fetch {url} yields {res.status_code}")
+        return res.content
+
+    @staticmethod
+    def _read_cache_file(file_name: str) -> bytes:
+        with open(file_name, "rb") as f:
+            return f.read()
+
+    def _is_cached(self, file_name: str) -> bool:
+        try:
+            mtime = os.path.getmtime(file_name)
+        except OSError:
+            return False
+        return self._max_cache_age is None or time.time() - mtime <= self._max_cache_age
+
+    @staticmethod
+    def _write_cache_file(file_name: str, data: bytes) -> None:
+        # write to a temporary file and rename it, so that concurrent readers never see a partially written tile
+        directory = os.path.dirname(file_name)
+        pathlib.Path(directory).mkdir(parents=True, exist_ok=True)
+        fd, tmp_file_name = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_file_name, file_name)
+        except BaseException:
+            os.remove(tmp_file_name)
+            raise
+
+    def _throttle(self, url: str) -> None:
+        # token bucket: bursts of up to max_request_burst requests pass immediately, the bucket refills at
+        # max_requests_per_second; each request takes a token, waiting for it if the bucket is empty
+        host = urlparse(url).netloc
+        rate = self._max_requests_per_second
+        with self._throttle_lock:
+            now = time.monotonic()
+            tokens, last = self._request_tokens.get(host, (float(self._max_request_burst), now))
+            tokens = min(float(self._max_request_burst), tokens + (now - last) * rate) - 1.0
+            self._request_tokens[host] = (tokens, now)
+        if tokens < 0:
+            time.sleep(-tokens / rate)
+
     def sanitized_name(self, name: str) -> str:
         """Return sanitized name
 
@@ -142,6 +142,23 @@ class Transformer:
         """
         return self._tile_size
 
+    def tiles(self) -> typing.List[typing.Tuple[int, int, int, int]]:
+        """Return the tiles covering the image
+
+        Returns:
+            typing.List[typing.Tuple[int, int, int, int]]: position (xx, yy) in the tile grid of the image and
+                tile index (x, y) of each tile
+        """
+        tiles = []
+        for yy in range(0, self._tiles_y):
+            y = self._first_tile_y + yy
+            if y < 0 or y >= self._number_of_tiles:
+                continue
+            for xx in range(0, self._tiles_x):
+                x = (self._first_tile_x + xx) % self._number_of_tiles
+                tiles.append((xx, yy, x, y))
+        return tiles
+
     @staticmethod
     def mercator(latlng: s2sphere.LatLng) -> typing.Tuple[float, float]:
         """Mercator projection
@@ -211,6 +228,27 @@ class Transformer:
         y = self._height / 2 + (y - self._tile_center_y) * s
         return x, y
 
+    def radians2pixels(
+        self, lats: typing.Sequence[float], lngs: typing.Sequence[float]
+    ) -> typing.List[typing.Tuple[float, float]]:
+        """Transform sequences of latitude and longitude values (in radians) into pixel values
+
+        Parameters:
+            lats (typing.Sequence[float]): latitudes in radians
+            lngs (typing.Sequence[float]): longitudes in radians
+
+        Returns:
+            typing.List[typing.Tuple[float, float]]: pixel values of given coordinates
+        """
+        scale = self._number_of_tiles * self._tile_size
+        x0 = self._width / 2 - self._tile_center_x * self._tile_size + 0.5 * scale
+        y0 = self._height / 2 - self._tile_center_y * self._tile_size + 0.5 * scale
+        k = scale / (2 * math.pi)
+        log = math.log
+        tan = math.tan
+        cos = math.cos
+        return [(x0 + lng * k, y0 - log(tan(lat) + (1 / cos(lat))) * k) for lat, lng in zip(lats, lngs)]
+
     def pixel2ll(self, x: float, y: float) -> s2sphere.LatLng:
         """Transform pixel values into LatLng values
 
@@ -0,0 +1,215 @@
+# py-staticmaps
+# Copyright (c) 2020 Florian Pigorsch; see /LICENSE for licensing information
+
+import collections
+import io
+import threading
+import typing
+
+import pytest  # type: ignore
+from PIL import Image as PIL_Image  # type: ignore
+
+import staticmaps
+
+from .mock_tile_downloader import MockTileDownloader
+
+cairo = pytest.importorskip("cairo")
+
+
+def encode(image: PIL_Image.Image, image_format: str) -> bytes:
+    data = io.BytesIO()
+    image.save(data, format=image_format)
+    return data.getvalue()
+
+
+def surface_data(surface: typing.Any) -> bytes:
+    surface.flush()
+    return bytes(surface.get_data())
+
+
+def assert_similar_surfaces(surface1: typing.Any, surface2: typing.Any, tolerance: int = 4) -> None:
+    # cairo doesn't guarantee bit identical results for different paths to the same drawing (e.g. replaying a
+    # recording surface vs. drawing directly) => only allow small per-channel differences, e.g. from antialiasing
+    data1 = surface_data(surface1)
+    data2 = surface_data(surface2)
+    assert len(data1) == len(data2)
+    assert max(abs(b1 - b2) for b1, b2 in zip(data1, data2)) <= tolerance
+
+
+def pixel(surface: typing.Any, x: int, y: int) -> typing.Tuple[int, int, int, int]:
+    surface.flush()
+    start = y * surface.get_stride() + 4 * x
+    end = start + 4
+    # ARGB32 pixels are stored as native endian 32 bit words => B, G, R, A on little endian machines
+    b, g, r, a = bytes(surface.get_data()[start:end])
+    return r, g, b, a
+
+
+class CountingTileDownloader:
+    """Return a solid PNG tile with a distinct color per (x, y) and count the downloads of each tile"""
+
+    def __init__(self, failing: typing.Optional[typing.Set[typing.Tuple[int, int]]] = None) -> None:
+        self.calls: typing.Counter[typing.Tuple[int, int, int]] = collections.Counter()
+        self._failing = failing or set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def color(x: int, y: int) -> typing.Tuple[int, int, int]:
+        return 40 + 100 * x, 40 + 100 * y, 200
+
+    def __call__(self, zoom: int, x: int, y: int) -> typing.Optional[bytes]:
+        with self._lock:
+            self.calls[(zoom, x, y)] += 1
+        if (x, y) in self._failing:
+            raise RuntimeError("download failed")
+        return encode(PIL_Image.new("RGB", (256, 256), self.color(x, y)), "PNG")
+
+
+def create_context() -> staticmaps.Context:
+    context = staticmaps.Context()
+    context.set_tile_downloader(MockTileDownloader())
+    context.set_center(staticmaps.create_latlng(48, 8))
+    context.set_zoom(10)
+    return context
+
+
+@pytest.mark.parametrize(
+    "mode, image_format",
+    [("P", "GIF"), ("L", "JPEG"), ("RGB", "JPEG"), ("LA", "TIFF"), ("1", "BMP"), ("I;16", "TIFF"), ("RGBA", "PNG")],
+)
+def test_create_image(mode: str, image_format: str) -> None:
+    image = PIL_Image.new("RGBA", (16, 8), (255, 255, 255, 255)).convert(mode)
+    surface = staticmaps.CairoRenderer.create_image(encode(image, image_format))
+    assert (surface.get_width(), surface.get_height()) == (16, 8)
+    # opaque white, independent of the pixel format of the encoded image
+    pixel = bytes(surface.get_data()[0:4])
+    assert pixel[3] == 255
+    assert all(value >= 250 for value in pixel[0:3])
+
+
+def test_render_tiles() -> None:
+    # at zoom 1 the world is only 512 pixels wide => each tile appears two or three times in the image
+    trans = staticmaps.Transformer(1000, 256, 1, staticmaps.create_latlng(0, 10), 256)
+    width, height = trans.image_size()
+    ts = trans.tile_size()
+    tiles = trans.tiles()
+    assert len(tiles) > len({(x, y) for _, _, x, y in tiles})
+
+    def check(renderer: staticmaps.CairoRenderer, failing: typing.Set[typing.Tuple[int, int]]) -> None:
+        for xx, yy, x, y in tiles:
+            x0 = int(xx * ts + trans.tile_offset_x())
+            y0 = int(yy * ts + trans.tile_offset_y())
+            if x0 >= width:
+                continue
+            expected = (0, 0, 0, 0) if (x, y) in failing else (*CountingTileDownloader.color(x, y), 255)
+            # the first and the last visible pixel of each tile => the tile is painted at exactly its offset
+            for px, py in [(max(0, x0), max(0, y0)), (min(width, x0 + ts) - 1, min(height, y0 + ts) - 1)]:
+                assert pixel(renderer.image_surface(), px, py) == expected
+
+    tile_cache = staticmaps.CairoTileCache()
+    download = CountingTileDownloader()
+    renderer = staticmaps.CairoRenderer(trans, tile_cache)
+    renderer.render_tiles(download, [], False)
+    # each distinct tile is downloaded once, even if it is painted at several positions
+    assert download.calls == collections.Counter({(1, x, y): 1 for x in range(2) for y in range(2)})
+    check(renderer, set())
+
+    # cached tiles are painted without downloading them again
+    cached_download = CountingTileDownloader()
+    cached_renderer = staticmaps.CairoRenderer(trans, tile_cache)
+    cached_renderer.render_tiles(cached_download, [], False)
+    assert not cached_download.calls
+    check(cached_renderer, set())
+
+    # tiles that fail to download are skipped, the other tiles are still painted
+    failing_download = CountingTileDownloader({(0, 1)})
+    failing_renderer = staticmaps.CairoRenderer(trans)
+    failing_renderer.render_tiles(failing_download, [], False)
+    assert failing_download.calls[(1, 0, 1)] == 1
+    check(failing_renderer, {(0, 1)})
+
+
+def test_world_copies_match_direct_rendering() -> None:
+    # at zoom 0 the world is much narrower than the image => the line is drawn in several world copies
+    trans = staticmaps.Transformer(800, 400, 0, staticmaps.create_latlng(0, 0), 256)
+    line = staticmaps.Line([staticmaps.create_latlng(20, -50), staticmaps.create_latlng(-20, 50)], width=3)
+    recorded = staticmaps.CairoRenderer(trans)
+    copies = recorded.world_copies([line])
+    assert len(copies) > 1
+    recorded.render_objects([line], False)
+
+    direct = staticmaps.CairoRenderer(trans)
+    for p in copies:
+        direct.context().set_matrix(cairo.Matrix(x0=p * trans.world_width()))
+        line.render_cairo(direct)
+
+    assert any(surface_data(recorded.image_surface()))
+    assert_similar_surfaces(recorded.image_surface(), direct.image_surface())
+
+
+def test_batched_lines_match_separate_rendering() -> None:
+    trans = staticmaps.Transformer(400, 300, 5, staticmaps.create_latlng(48, 8), 256)
+    line1 = staticmaps.Line([staticmaps.create_latlng(47, 5), staticmaps.create_latlng(47, 11)], width=3)
+    line2 = staticmaps.Line([staticmaps.create_latlng(49, 5), staticmaps.create_latlng(49, 11)], width=3)
+    # pylint: disable=protected-access
+    assert staticmaps.CairoRenderer._batch_objects([line1, line2]) == [[line1, line2]]
+
+    batched = staticmaps.CairoRenderer(trans)
+    batched.render_objects([line1, line2], False)
+    separate = staticmaps.CairoRenderer(trans)
+    line1.render_cairo(separate)
+    line2.render_cairo(separate)
+
+    assert_similar_surfaces(batched.image_surface(), separate.image_surface())
+
+
+def test_released_surface_is_reused_and_cleared() -> None:
+    context = create_context()
+    context.add_object(staticmaps.Line([staticmaps.create_latlng(47.9, 7.9), staticmaps.create_latlng(48.1, 8.1)]))
+    image = context.render_cairo(200, 100, attribution=False)
+    assert any(surface_data(image))
+    context.release_cairo_surface(image)
+
+    context.remove_latest_object()
+    reused = context.render_cairo(200, 100, attribution=False)
+    assert reused is image
+    assert not any(surface_data(reused))
+
+    # surfaces of a different size are not reused
+    assert context.render_cairo(100, 100, attribution=False) is not image
+    with pytest.raises(ValueError):
+        trans = staticmaps.Transformer(100, 100, 10, staticmaps.create_latlng(48, 8), 256)
+        staticmaps.CairoRenderer(trans, surface=image)
+
+
+def test_surface_format() -> None:
+    context = create_context()
+    image = context.render_cairo(200, 100)
+    assert image.get_format() == cairo.FORMAT_ARGB32
+
+    # an opaque background => no alpha channel needed
+    context.set_background_color(staticmaps.WHITE)
+    opaque_image = context.render_cairo(200, 100)
+    assert opaque_image.get_format() == cairo.FORMAT_RGB24
+    assert not staticmaps.CairoRenderer.has_alpha(opaque_image)
+
+    # pooled surfaces are only reused for the same format
+    context.release_cairo_surface(image)
+    assert context.render_cairo(200, 100) is not image
+
+
+@pytest.mark.parametrize("width", [100, 300, 800])
+def test_attribution_fits_image_width(width: int) -> None:
+    trans = staticmaps.Transformer(width, 100, 10, staticmaps.create_latlng(48, 8), 256)
+    renderer = staticmaps.CairoRenderer(trans)
+    attribution = "Maps & Data (C) OpenStreetMap.org contributors, Map style (C) SomeTileProvider"
+    renderer.render_attribution(attribution)
+    # the chosen font size is left in the context
+    font_size = renderer.context().get_font_matrix().xx
+    assert 0.25 <= font_size <= 9
+    # allow for hinting, which makes the text width not exactly proportional to the font size
+    assert renderer.context().text_extents(attribution).width <= width - 4 + 1
+    if width == 800:
+        assert font_size == 9
+    # the attribution box is painted at the bottom of the image, up to the bottom right pixel
+    assert any(surface_data(renderer.image_surface())[-4:])
@@ -0,0 +1,37 @@
+# py-staticmaps
+# Copyright (c) 2020 Florian Pigorsch; see /LICENSE for licensing information
+
+import pytest  # type: ignore
+
+import staticmaps
+
+
+def test_bad_creation() -> None:
+    with pytest.raises(ValueError):
+        staticmaps.CairoTileCache(0)
+
+
+def test_get_put() -> None:
+    cache = staticmaps.CairoTileCache()
+    assert cache.get(1, 2, 3) is None
+
+    tile = object()
+    cache.put(1, 2, 3, tile)
+    assert cache.get(1, 2, 3) is tile
+    assert cache.get(1, 3, 2) is None
+
+    cache.clear()
+    assert cache.get(1, 2, 3) is None
+
+
+def test_evicts_least_recently_used() -> None:
+    cache = staticmaps.CairoTileCache(2)
+    tile1, tile2, tile3 = object(), object(), object()
+    cache.put(1, 0, 0, tile1)
+    cache.put(1, 1, 0, tile2)
+    assert cache.get(1, 0, 0) is tile1
+
+    cache.put(1, 2, 0, tile3)
+    assert cache.get(1, 0, 0) is tile1
+    assert cache.get(1, 1, 0) is None
+    assert cache.get(1, 2, 0) is tile3
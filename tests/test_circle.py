@@ -0,0 +1,27 @@
+# py-staticmaps
+# Copyright (c) 2020 Florian Pigorsch; see /LICENSE for licensing information
+
+import math
+
+import staticmaps
+
+
+def test_opaque_pixel_rect() -> None:
+    center = staticmaps.create_latlng(49, 8.5)
+    trans = staticmaps.Transformer(800, 500, 6, center, 256)
+    circle = staticmaps.Circle(center, 500, fill_color=staticmaps.BLUE)
+    rect = circle.opaque_pixel_rect(trans)
+    assert rect is not None
+    left, top, right, bottom = rect
+    cx, cy = trans.ll2pixel(center)
+    assert left < cx < right
+    assert top < cy < bottom
+    # all corners of the rect are inside the circle
+    xys = circle.pixels(trans)
+    radius = min(math.hypot(x - cx, y - cy) for x, y in xys)
+    for x, y in [(left, top), (right, top), (left, bottom), (right, bottom)]:
+        assert math.hypot(x - cx, y - cy) < radius
+
+    translucent = staticmaps.Circle(center, 500, fill_color=staticmaps.parse_color("#0000ff80"))
+    assert translucent.opaque_pixel_rect(trans) is None
+    assert staticmaps.Circle(center, 0.001).opaque_pixel_rect(trans) is None
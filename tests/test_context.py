@@ -3,6 +3,8 @@
 # py-staticmaps
 # Copyright (c) 2020 Florian Pigorsch; see /LICENSE for licensing information
 
+import typing
+
 import pytest  # type: ignore
 import s2sphere  # type: ignore
 
@@ -151,6 +153,12 @@ def test_set_wrong_zoom_raises_exception() -> None:
         context.set_zoom(31)
 
 
+def test_set_wrong_max_download_workers_raises_exception() -> None:
+    context = staticmaps.Context()
+    with pytest.raises(ValueError):
+        context.set_max_download_workers(0)
+
+
 def test_render_empty_raises_exception() -> None:
     context = staticmaps.Context()
     with pytest.raises(RuntimeError):
@@ -179,3 +187,37 @@ def test_render_with_center_without_zoom_sets_zoom_15() -> None:
     context.set_center(staticmaps.create_latlng(48, 8))
     context.render_svg(200, 100)
     assert context.determine_center_zoom(200, 100) == (staticmaps.create_latlng(48, 8), 15)
+
+
+def test_render_fetches_each_tile_once() -> None:
+    class CountingTileDownloader(MockTileDownloader):
+        def __init__(self) -> None:
+            super().__init__()
+            self.requested: typing.List[typing.Tuple[int, int, int]] = []
+
+        def get(
+            self, provider: staticmaps.TileProvider, cache_dir: str, zoom: int, x: int, y: int
+        ) -> typing.Optional[bytes]:
+            self.requested.append((zoom, x, y))
+            return super().get(provider, cache_dir, zoom, x, y)
+
+    downloader = CountingTileDownloader()
+    context = staticmaps.Context()
+    context.set_tile_downloader(downloader)
+    context.set_center(staticmaps.create_latlng(48, 8))
+    context.set_zoom(15)
+    context.render_pillow(800, 500)
+    assert downloader.requested
+    assert len(downloader.requested) == len(set(downloader.requested))
+
+
+def test_close() -> None:
+    with staticmaps.Context() as context:
+        context.set_tile_downloader(MockTileDownloader())
+        context.set_center(staticmaps.create_latlng(48, 8))
+        context.set_zoom(15)
+        context.render_pillow(200, 100)
+    # the context can still be used after closing it
+    context.render_svg(200, 100)
+    context.close()
+    context.close()
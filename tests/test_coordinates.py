@@ -57,3 +57,13 @@ def test_parse_latlngs2rect(good: str) -> None:
 def test_parse_latlngs2rect_raises_value_error(bad: str) -> None:
     with pytest.raises(ValueError):
         staticmaps.parse_latlngs2rect(bad)
+
+
+def test_create_latlngs() -> None:
+    latlngs = staticmaps.create_latlngs([48, 49.5], [8, -7.25])
+    assert latlngs == [staticmaps.create_latlng(48, 8), staticmaps.create_latlng(49.5, -7.25)]
+
+    assert not staticmaps.create_latlngs([], [])
+
+    with pytest.raises(ValueError):
+        staticmaps.create_latlngs([48, 49], [8])
@@ -16,6 +16,9 @@ def test_bad_creation() -> None:
     with pytest.raises(ValueError):
         staticmaps.Line([staticmaps.create_latlng(48, 8), staticmaps.create_latlng(49, 9)], width=-123)
 
+    with pytest.raises(ValueError):
+        staticmaps.Line([staticmaps.create_latlng(48, 8), staticmaps.create_latlng(49, 9)], simplify_px=-1)
+
 
 def test_creation() -> None:
     staticmaps.Line(
@@ -30,3 +33,94 @@ def test_bounds() -> None:
         color=staticmaps.YELLOW,
     )
     assert not line.bounds().is_point()
+
+
+def test_cairo_batch_key() -> None:
+    latlngs = [staticmaps.create_latlng(48, 8), staticmaps.create_latlng(49, 9)]
+    line1 = staticmaps.Line(latlngs, color=staticmaps.YELLOW, width=3)
+    line2 = staticmaps.Line(latlngs, color=staticmaps.YELLOW, width=3)
+    assert line1.cairo_batch_key() is not None
+    assert line1.cairo_batch_key() == line2.cairo_batch_key()
+    assert line1.cairo_batch_key() != staticmaps.Line(latlngs, color=staticmaps.YELLOW, width=2).cairo_batch_key()
+
+    # transparent lines, invisible lines and areas are rendered on their own
+    assert staticmaps.Line(latlngs, color=staticmaps.Color(255, 0, 0, 128)).cairo_batch_key() is None
+    assert staticmaps.Line(latlngs, width=0).cairo_batch_key() is None
+    assert staticmaps.Area(latlngs + [staticmaps.create_latlng(48, 9)], color=staticmaps.RED).cairo_batch_key() is None
+
+
+def test_pixel_bounds() -> None:
+    latlngs = [staticmaps.create_latlng(48, 8), staticmaps.create_latlng(49, 9), staticmaps.create_latlng(50, 8)]
+    line = staticmaps.Line(latlngs, width=4)
+    trans = staticmaps.Transformer(800, 500, 6, staticmaps.create_latlng(49, 8.5), 256)
+    bounds = line.pixel_bounds(trans)
+    assert bounds is not None
+    l, t, r, b = bounds
+    for latlng in latlngs:
+        x, y = trans.ll2pixel(latlng)
+        # the outermost points are exactly half the line width away from the bounds
+        assert x >= l + 2 or x == pytest.approx(l + 2)
+        assert x <= r - 2 or x == pytest.approx(r - 2)
+        assert y >= t + 2 or y == pytest.approx(t + 2)
+        assert y <= b - 2 or y == pytest.approx(b - 2)
+
+
+def test_simplify() -> None:
+    # nearly collinear points are removed
+    xys = [(0.0, 0.0), (1.0, 0.1), (2.0, -0.1), (3.0, 0.0), (4.0, 5.0)]
+    assert staticmaps.Line.simplify(xys, 0.5) == [(0.0, 0.0), (3.0, 0.0), (4.0, 5.0)]
+    assert staticmaps.Line.simplify(xys, 0) == xys
+
+    # points going back and forth along the same line are kept
+    xys = [(0.0, 0.0), (10.0, 0.0), (5.0, 0.0)]
+    assert staticmaps.Line.simplify(xys, 0.5) == xys
+
+    # dense points along a straight line are reduced to the end points
+    xys = [(0.01 * i, 0.0) for i in range(10001)]
+    assert staticmaps.Line.simplify(xys, 0.5) == [xys[0], xys[-1]]
+
+    # long polylines with sparse points are only thinned out
+    xys = [(float(i), 3.0 * (i % 2)) for i in range(5000)]
+    assert staticmaps.Line.simplify(xys, 0.5) == xys
+
+
+def test_latlngs() -> None:
+    latlngs = [staticmaps.create_latlng(48, 8), staticmaps.create_latlng(49, 9), staticmaps.create_latlng(50, 8)]
+    line = staticmaps.Line(latlngs)
+    assert line.latlngs() == latlngs
+    assert line.interpolate() == latlngs
+
+
+def test_from_degrees() -> None:
+    lats = [48.0, 49.0, 50.0]
+    lngs = [8.0, 9.0, 8.0]
+    line = staticmaps.Line.from_degrees(lats, lngs, width=4)
+    expected = staticmaps.Line([staticmaps.create_latlng(lat, lng) for lat, lng in zip(lats, lngs)], width=4)
+    assert line.latlngs() == expected.latlngs()
+    assert line.width() == 4
+    trans = staticmaps.Transformer(800, 500, 6, staticmaps.create_latlng(49, 8.5), 256)
+    assert line.pixels(trans) == expected.pixels(trans)
+
+    with pytest.raises(ValueError):
+        staticmaps.Line.from_degrees([48.0, 49.0], [8.0])
+    with pytest.raises(ValueError):
+        staticmaps.Line.from_degrees([48.0], [8.0])
+    with pytest.raises(ValueError):
+        staticmaps.Line.from_degrees(lats, lngs, width=-1)
+
+    # subclasses have their own constructors
+    with pytest.raises(TypeError):
+        staticmaps.Area.from_degrees(lats, lngs)
+    with pytest.raises(TypeError):
+        staticmaps.Circle.from_degrees(lats, lngs)
+
+
+def test_pixels_cache() -> None:
+    line = staticmaps.Line([staticmaps.create_latlng(48, 8), staticmaps.create_latlng(49, 9)])
+    trans = staticmaps.Transformer(800, 500, 6, staticmaps.create_latlng(49, 8.5), 256)
+    xys = line.pixels(trans)
+    assert line.pixels(trans) is xys
+    # a different transformer projects the line again
+    other = staticmaps.Transformer(800, 500, 7, staticmaps.create_latlng(49, 8.5), 256)
+    assert line.pixels(other) != xys
+    assert line.pixels(trans) == xys
@@ -0,0 +1,20 @@
+# py-staticmaps
+# Copyright (c) 2020 Florian Pigorsch; see /LICENSE for licensing information
+
+import staticmaps
+
+
+def test_visible_tiles() -> None:
+    center = staticmaps.create_latlng(49, 8.5)
+    trans = staticmaps.Transformer(800, 500, 6, center, 256)
+    renderer = staticmaps.PillowRenderer(trans)
+    tiles = trans.tiles()
+    assert renderer.visible_tiles([]) == tiles
+
+    visible = renderer.visible_tiles([staticmaps.Circle(center, 5000, fill_color=staticmaps.BLUE)])
+    assert len(visible) < len(tiles)
+    assert all(tile in tiles for tile in visible)
+
+    # transparent circles don't hide anything
+    transparent = staticmaps.Circle(center, 5000, fill_color=staticmaps.TRANSPARENT)
+    assert renderer.visible_tiles([transparent]) == tiles
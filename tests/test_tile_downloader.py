@@ -0,0 +1,105 @@
+# py-staticmaps
+# Copyright (c) 2020 Florian Pigorsch; see /LICENSE for licensing information
+
+import os
+import pathlib
+import time
+import typing
+
+import pytest  # type: ignore
+import requests  # type: ignore
+
+import staticmaps
+
+
+def test_set_wrong_max_requests_per_second_raises_exception() -> None:
+    downloader = staticmaps.TileDownloader()
+    with pytest.raises(ValueError):
+        downloader.set_max_requests_per_second(0)
+    with pytest.raises(ValueError):
+        downloader.set_max_requests_per_second(-1)
+
+
+def test_set_wrong_max_cache_age_raises_exception() -> None:
+    downloader = staticmaps.TileDownloader()
+    with pytest.raises(ValueError):
+        downloader.set_max_cache_age(-1)
+    downloader.set_max_cache_age(None)
+
+
+def test_get_uses_cache_until_expired(tmp_path: pathlib.Path) -> None:
+    downloader = staticmaps.TileDownloader()
+    provider = staticmaps.tile_provider_None
+    cache_dir = str(tmp_path)
+    file_name = downloader.cache_file_name(provider, cache_dir, 1, 2, 3)
+    # pylint: disable=protected-access
+    downloader._write_cache_file(file_name, b"tile")
+    assert downloader.get(provider, cache_dir, 1, 2, 3) == b"tile"
+    assert not [f for f in os.listdir(os.path.dirname(file_name)) if f.endswith(".tmp")]
+
+    # expired tiles are downloaded again (the "none" provider has no url => no tile)
+    old = time.time() - 3600
+    os.utime(file_name, (old, old))
+    downloader.set_max_cache_age(60)
+    assert downloader.get(provider, cache_dir, 1, 2, 3) is None
+    downloader.set_max_cache_age(None)
+    assert downloader.get(provider, cache_dir, 1, 2, 3) == b"tile"
+
+
+def test_get_falls_back_to_expired_cache(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    downloader = staticmaps.TileDownloader()
+    provider = staticmaps.tile_provider_OSM
+    cache_dir = str(tmp_path)
+    file_name = downloader.cache_file_name(provider, cache_dir, 1, 0, 0)
+    # pylint: disable=protected-access
+    downloader._write_cache_file(file_name, b"tile")
+    old = time.time() - 3600
+    os.utime(file_name, (old, old))
+    downloader.set_max_cache_age(60)
+
+    def unreachable(*args: typing.Any, **kwargs: typing.Any) -> typing.Any:
+        raise requests.ConnectionError("unreachable")
+
+    monkeypatch.setattr(downloader._session, "get", unreachable)
+    assert downloader.get(provider, cache_dir, 1, 0, 0) == b"tile"
+
+    def not_found(*args: typing.Any, **kwargs: typing.Any) -> typing.Any:
+        response = requests.Response()
+        response.status_code = 404
+        return response
+
+    monkeypatch.setattr(downloader._session, "get", not_found)
+    assert downloader.get(provider, cache_dir, 1, 0, 0) == b"tile"
+
+    # without a cached tile, the error is passed on
+    with pytest.raises(RuntimeError):
+        downloader.get(provider, cache_dir, 1, 1, 0)
+    monkeypatch.setattr(downloader._session, "get", unreachable)
+    with pytest.raises(requests.ConnectionError):
+        downloader.get(provider, cache_dir, 1, 1, 0)
+
+
+def test_throttle_allows_bursts() -> None:
+    downloader = staticmaps.TileDownloader()
+    downloader.set_max_requests_per_second(50)
+    downloader.set_max_request_burst(8)
+    url = "https://tiles.example.com/1/2/3.png"
+    # pylint: disable=protected-access
+    start = time.monotonic()
+    for _ in range(8):
+        downloader._throttle(url)
+    assert time.monotonic() - start < 0.1
+
+    # sustained requests are limited to the configured rate
+    start = time.monotonic()
+    for _ in range(10):
+        downloader._throttle(url)
+    assert time.monotonic() - start >= 10 / 50 - 0.02
+
+    # other hosts have their own bucket
+    start = time.monotonic()
+    downloader._throttle("https://other.example.com/1/2/3.png")
+    assert time.monotonic() - start < 0.1
+
+    with pytest.raises(ValueError):
+        downloader.set_max_request_burst(0)
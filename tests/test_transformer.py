@@ -0,0 +1,19 @@
+# py-staticmaps
+# Copyright (c) 2020 Florian Pigorsch; see /LICENSE for licensing information
+
+import pytest  # type: ignore
+
+import staticmaps
+
+
+def test_radians2pixels_matches_ll2pixel() -> None:
+    trans = staticmaps.Transformer(800, 500, 6, staticmaps.create_latlng(49, 8.5), 256)
+    latlngs = [staticmaps.create_latlng(48, 8), staticmaps.create_latlng(-33.9, 151.2), staticmaps.create_latlng(0, 0)]
+    lats = [latlng.lat().radians for latlng in latlngs]
+    lngs = [latlng.lng().radians for latlng in latlngs]
+    xys = trans.radians2pixels(lats, lngs)
+    assert len(xys) == len(latlngs)
+    for latlng, (x, y) in zip(latlngs, xys):
+        assert (x, y) == pytest.approx(trans.ll2pixel(latlng))
+
+    assert not trans.radians2pixels([], [])